@@ -4,6 +4,9 @@ from typing import Optional
 
 import aiohttp
 
+import constants
+from beatmap_index import BeatmapIndex
+
 
 @dataclass
 class ValidationResponse:
@@ -43,6 +46,11 @@ class ApiResponse:
     failures: list[int]
 
 
+beatmap_index = BeatmapIndex(
+    constants.BEATMAP_INDEX_FILE, max_entries=constants.BEATMAP_INDEX_MAX_ENTRIES
+)
+
+
 # API response:
 # - Types: https://github.com/hburn7/omc-api/blob/6ca27c3ac58f0ece8616eacf37ff4c1a7e7b7a32/src/lib/dataTypes.ts#L33
 # - Response: https://github.com/hburn7/omc-api/blob/master/index.ts#L57
@@ -57,22 +65,71 @@ async def validate(
     if strict:
         endpoint += "?strict=true"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            endpoint, json=beatmap_ids, headers={"X-Api-Key": secret}
-        ) as response:
-            if response.status != 200:
-                data = await response.json()
-                print(f"Failed to validate beatmaps due to non-200 status code: {data}")
-                return None
+    # Compliance is decided per beatmapset, so only one difficulty of each
+    # already-known set is sent upstream and the results are expanded back.
+    await beatmap_index.load()
+    groups = beatmap_index.group(beatmap_ids)
 
+    async with aiohttp.ClientSession() as session:
+        api_response = await _post_validate(session, endpoint, secret, list(groups))
+        if api_response is None:
+            return None
+
+        # A failed representative (e.g. a deleted difficulty) says nothing about
+        # its siblings, so they are retried on their own.
+        retry_ids = [
+            beatmap_id
+            for failure in api_response.failures
+            for beatmap_id in groups.get(failure, [])[1:]
+        ]
+        if retry_ids:
+            retry_response = await _post_validate(session, endpoint, secret, retry_ids)
+            if retry_response is None:
+                api_response.failures.extend(retry_ids)
+            else:
+                api_response.results.extend(retry_response.results)
+                api_response.failures.extend(retry_response.failures)
+
+    beatmap_index.update_many(
+        [(r.beatmapsetId, r.beatmapIds) for r in api_response.results]
+    )
+    beatmap_index.discard(api_response.failures)
+
+    api_response.results = [_expand_result(r, groups) for r in api_response.results]
+    return api_response
+
+
+async def _post_validate(
+    session: aiohttp.ClientSession, endpoint: str, secret: str, beatmap_ids: list[int]
+) -> Optional[ApiResponse]:
+    async with session.post(
+        endpoint, json=beatmap_ids, headers={"X-Api-Key": secret}
+    ) as response:
+        if response.status != 200:
             data = await response.json()
-            all_results = [
-                ValidationResponse(**result) for result in data.get("results", [])
-            ]
-            all_failures = data.get("failures", [])
+            print(f"Failed to validate beatmaps due to non-200 status code: {data}")
+            return None
+
+        data = await response.json()
+        all_results = [
+            ValidationResponse(**result) for result in data.get("results", [])
+        ]
+        all_failures = data.get("failures", [])
+
+        return ApiResponse(results=all_results, failures=all_failures)
+
+
+def _expand_result(
+    result: ValidationResponse, groups: dict[int, list[int]]
+) -> ValidationResponse:
+    beatmap_ids = list(result.beatmapIds)
+    for representative in result.beatmapIds:
+        for beatmap_id in groups.get(representative, []):
+            if beatmap_id not in beatmap_ids:
+                beatmap_ids.append(beatmap_id)
 
-            return ApiResponse(results=all_results, failures=all_failures)
+    result.beatmapIds = beatmap_ids
+    return result
 
 
 async def validate_metadata(
@@ -0,0 +1,126 @@
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+
+logger = logging.getLogger("beatmap_index")
+
+
+class BeatmapIndex:
+    """Persistent beatmap ID -> beatmapset ID map built from past validation responses.
+
+    Entries are kept in least-recently-used order and capped at ``max_entries``.
+    Changes are only written to disk by :meth:`flush` / :meth:`save`.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        self.path = path
+        self.max_entries = max_entries
+        self._sets: OrderedDict[int, int] = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+
+    async def load(self) -> None:
+        """Reads the index from disk off the event loop. Only the first call does any work."""
+        if self._loaded:
+            return
+
+        self._loaded = True
+        sets = await asyncio.to_thread(self._read)
+
+        # Entries learned before the load finished are the most recent
+        sets.update(self._sets)
+        self._sets = sets
+        self._trim()
+        logger.debug(f"Loaded {len(self._sets)} beatmap index entries")
+
+    def _read(self) -> OrderedDict[int, int]:
+        if not os.path.exists(self.path):
+            return OrderedDict()
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return OrderedDict((int(k), int(v)) for k, v in data.items())
+        except (OSError, ValueError, AttributeError, TypeError) as e:
+            logger.warning(f"Failed to load beatmap index from {self.path}: {e}")
+            return OrderedDict()
+
+    def _write(self, data: dict[str, int]) -> bool:
+        directory = os.path.dirname(self.path)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to save beatmap index to {self.path}: {e}")
+            return False
+
+        return True
+
+    def _snapshot(self) -> dict[str, int]:
+        # Cleared up front so changes made while a flush is writing stay
+        # pending; a failed write marks the index dirty again.
+        self._dirty = False
+        return {str(k): v for k, v in self._sets.items()}
+
+    async def flush(self) -> None:
+        """Writes pending changes to disk off the event loop."""
+        if not self._dirty:
+            return
+
+        if await asyncio.to_thread(self._write, self._snapshot()):
+            logger.debug(f"Saved {len(self._sets)} beatmap index entries")
+        else:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Writes pending changes to disk, blocking. Meant for shutdown."""
+        if self._dirty and not self._write(self._snapshot()):
+            self._dirty = True
+
+    def _trim(self) -> None:
+        while len(self._sets) > self.max_entries:
+            self._sets.popitem(last=False)
+
+    def group(self, beatmap_ids: list[int]) -> dict[int, list[int]]:
+        """Groups beatmap IDs by a representative ID, one group per known beatmapset.
+
+        The representative is always the first ID of its group. Unknown beatmap
+        IDs form their own single-item group.
+        """
+        representatives: dict[int, int] = {}
+        groups: dict[int, list[int]] = {}
+
+        for beatmap_id in beatmap_ids:
+            beatmapset_id = self._sets.get(beatmap_id)
+            if beatmapset_id is None:
+                groups.setdefault(beatmap_id, []).append(beatmap_id)
+                continue
+
+            self._sets.move_to_end(beatmap_id)
+            representative = representatives.setdefault(beatmapset_id, beatmap_id)
+            groups.setdefault(representative, []).append(beatmap_id)
+
+        return groups
+
+    def update_many(self, entries: list[tuple[int, list[int]]]) -> None:
+        """Records each beatmapset's beatmap IDs."""
+        for beatmapset_id, beatmap_ids in entries:
+            for beatmap_id in beatmap_ids:
+                if self._sets.get(beatmap_id) != beatmapset_id:
+                    self._dirty = True
+                self._sets[beatmap_id] = beatmapset_id
+                self._sets.move_to_end(beatmap_id)
+
+        self._trim()
+
+    def discard(self, beatmap_ids: list[int]) -> None:
+        """Forgets beatmap IDs, e.g. difficulties that failed upstream."""
+        for beatmap_id in beatmap_ids:
+            if self._sets.pop(beatmap_id, None) is not None:
+                self._dirty = True
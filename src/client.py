@@ -8,11 +8,14 @@ from typing import Optional, Sequence, Union
 
 import discord
 from discord import Embed, app_commands
+from discord.ext import tasks
 from dotenv import load_dotenv
 from reactionmenu import ViewButton, ViewMenu
 
 import api
 import constants
+from menu_registry import MenuRegistry
+from workers import LoopLagMonitor, WorkerPool
 
 AnyValidationResponse = Union[api.ValidationResponse, api.RawValidationResponse]
 
@@ -29,6 +32,17 @@ intents.members = True
 client = discord.Client(intents=intents)
 tree = app_commands.CommandTree(client)
 
+menu_registry = MenuRegistry(
+    max_menus=constants.MENU_MAX_ACTIVE,
+    max_menus_per_guild=constants.MENU_MAX_PER_GUILD,
+)
+
+worker_pool = WorkerPool()
+loop_lag_monitor = LoopLagMonitor(
+    interval=constants.LOOP_LAG_INTERVAL,
+    warn_threshold=constants.LOOP_LAG_WARN_THRESHOLD,
+)
+
 
 @dataclass
 class CategorizedResponses:
@@ -242,6 +256,59 @@ class InputSanitizer:
         return ids
 
 
+class InvalidCsvError(Exception):
+    pass
+
+
+class CsvParser:
+    @staticmethod
+    def parse(raw_bytes: bytes) -> list[dict]:
+        try:
+            text = raw_bytes.decode("utf-8")
+        except UnicodeDecodeError:
+            text = raw_bytes.decode("utf-8-sig")
+
+        reader = csv.DictReader(io.StringIO(text))
+        if reader.fieldnames is None:
+            raise InvalidCsvError("CSV file appears to be empty or has no header row.")
+
+        lower_fields = {f.lower().strip(): f for f in reader.fieldnames}
+        if "artist" not in lower_fields or "title" not in lower_fields:
+            raise InvalidCsvError("CSV must contain `artist` and `title` columns.")
+
+        artist_col = lower_fields["artist"]
+        title_col = lower_fields["title"]
+        artist_unicode_col = lower_fields.get("artist_unicode")
+        title_unicode_col = lower_fields.get("title_unicode")
+
+        inputs = []
+        for row in reader:
+            artist = (row.get(artist_col) or "").strip()
+            title = (row.get(title_col) or "").strip()
+            if not artist or not title:
+                continue
+
+            artist_unicode = (
+                (row.get(artist_unicode_col) or "").strip()
+                if artist_unicode_col
+                else ""
+            )
+            title_unicode = (
+                (row.get(title_unicode_col) or "").strip() if title_unicode_col else ""
+            )
+
+            inputs.append(
+                {
+                    "artist": artist,
+                    "title": title,
+                    "artist_unicode": artist_unicode or artist,
+                    "title_unicode": title_unicode or title,
+                }
+            )
+
+        return inputs
+
+
 class MenuBuilder:
     @staticmethod
     def create_embeds(
@@ -307,7 +374,7 @@ class MenuBuilder:
         return footer
 
     @staticmethod
-    def create_menu(
+    async def create_menu(
         interaction: discord.Interaction,
         responses: Sequence[AnyValidationResponse],
         failed_ids: Optional[list[int]] = None,
@@ -318,8 +385,19 @@ class MenuBuilder:
                 f"Creating menu for {len(responses)} responses and {len(failed_ids or [])} failures"
             )
 
-            categorized = ResponseFormatter.categorize_responses(
-                responses, failed_ids, is_raw=is_raw
+            # Large results are categorized and rendered off the event loop
+            offload = (
+                len(responses) + len(failed_ids or [])
+                >= constants.MENU_OFFLOAD_RESPONSES
+            )
+
+            categorized = await worker_pool.run(
+                ResponseFormatter.categorize_responses,
+                responses,
+                failed_ids,
+                is_raw=is_raw,
+                offload=offload,
+                pure=True,
             )
             combined = categorized.get_combined_list()
 
@@ -327,8 +405,13 @@ class MenuBuilder:
 
             status_text, color = MenuBuilder.get_status_color(categorized)
 
-            embeds = MenuBuilder.create_embeds(
-                combined, categorized.failed_ids, "Validation Result", color
+            embeds = await worker_pool.run(
+                MenuBuilder.create_embeds,
+                combined,
+                categorized.failed_ids,
+                "Validation Result",
+                color,
+                offload=offload,
             )
 
             logger.debug(f"Created {len(embeds)} embed(s)")
@@ -337,7 +420,11 @@ class MenuBuilder:
             for embed in embeds:
                 embed.set_footer(text=footer_text)
 
-            view_menu = ViewMenu(interaction, menu_type=ViewMenu.TypeEmbed)
+            view_menu = ViewMenu(
+                interaction,
+                menu_type=ViewMenu.TypeEmbed,
+                timeout=constants.MENU_IDLE_TIMEOUT,
+            )
             view_menu.add_pages(embeds)
 
             logger.debug(f"ViewMenu created with {len(embeds)} pages")
@@ -389,9 +476,35 @@ def setup_logging() -> None:
     logger.info(f"Logging configured at {log_level} level")
 
 
+@tasks.loop(seconds=constants.BEATMAP_INDEX_FLUSH_INTERVAL)
+async def flush_beatmap_index():
+    await api.beatmap_index.flush()
+
+
+@tasks.loop(seconds=constants.STATS_INTERVAL)
+async def log_stats():
+    logger.info(
+        f"Live menus: {menu_registry.live_count}, "
+        f"~{menu_registry.estimated_bytes} bytes of page text, "
+        f"max event loop lag {loop_lag_monitor.pop_max_lag():.3f}s"
+    )
+
+
+@tasks.loop(seconds=constants.LOOP_LAG_INTERVAL)
+async def monitor_loop_lag():
+    loop_lag_monitor.tick()
+
+
 @client.event
 async def on_ready():
     logger.info(f"Logged in as {client.user}")
+    if not flush_beatmap_index.is_running():
+        flush_beatmap_index.start()
+    if not log_stats.is_running():
+        log_stats.start()
+    if not monitor_loop_lag.is_running():
+        loop_lag_monitor.reset()
+        monitor_loop_lag.start()
     await tree.sync()
     logger.info("Commands synced, bot is ready!")
 
@@ -430,7 +543,7 @@ async def validate(ctx: discord.Interaction, u_input: str, strict: bool = False)
                 f"Failed to process {len(api_response.failures)} beatmaps: {api_response.failures}"
             )
 
-        view_menu = MenuBuilder.create_menu(
+        view_menu = await MenuBuilder.create_menu(
             ctx, api_response.results, api_response.failures
         )
         if view_menu is None:
@@ -441,6 +554,7 @@ async def validate(ctx: discord.Interaction, u_input: str, strict: bool = False)
 
         logger.debug("Starting ViewMenu")
         await view_menu.start()
+        await menu_registry.register(view_menu, ctx.guild_id)
         logger.debug("ViewMenu started successfully")
 
     except ValueError as e:
@@ -471,52 +585,16 @@ async def validate_csv(
     try:
         raw_bytes = await file.read()
         try:
-            text = raw_bytes.decode("utf-8")
-        except UnicodeDecodeError:
-            text = raw_bytes.decode("utf-8-sig")
-
-        reader = csv.DictReader(io.StringIO(text))
-        if reader.fieldnames is None:
-            await ctx.followup.send(
-                "CSV file appears to be empty or has no header row."
+            inputs = await worker_pool.run(
+                CsvParser.parse,
+                raw_bytes,
+                offload=len(raw_bytes) >= constants.CSV_OFFLOAD_BYTES,
+                pure=True,
             )
+        except InvalidCsvError as e:
+            await ctx.followup.send(str(e))
             return
 
-        lower_fields = {f.lower().strip(): f for f in reader.fieldnames}
-        if "artist" not in lower_fields or "title" not in lower_fields:
-            await ctx.followup.send("CSV must contain `artist` and `title` columns.")
-            return
-
-        artist_col = lower_fields["artist"]
-        title_col = lower_fields["title"]
-        artist_unicode_col = lower_fields.get("artist_unicode")
-        title_unicode_col = lower_fields.get("title_unicode")
-
-        inputs = []
-        for row in reader:
-            artist = (row.get(artist_col) or "").strip()
-            title = (row.get(title_col) or "").strip()
-            if not artist or not title:
-                continue
-
-            artist_unicode = (
-                (row.get(artist_unicode_col) or "").strip()
-                if artist_unicode_col
-                else ""
-            )
-            title_unicode = (
-                (row.get(title_unicode_col) or "").strip() if title_unicode_col else ""
-            )
-
-            inputs.append(
-                {
-                    "artist": artist,
-                    "title": title,
-                    "artist_unicode": artist_unicode or artist,
-                    "title_unicode": title_unicode or title,
-                }
-            )
-
         if not inputs:
             await ctx.followup.send("No valid rows found in the CSV file.")
             return
@@ -534,7 +612,7 @@ async def validate_csv(
             await ctx.followup.send("No results received from the API.")
             return
 
-        view_menu = MenuBuilder.create_menu(ctx, results, is_raw=True)
+        view_menu = await MenuBuilder.create_menu(ctx, results, is_raw=True)
         if view_menu is None:
             await ctx.followup.send(
                 "An error occurred while creating the response menu."
@@ -542,6 +620,7 @@ async def validate_csv(
             return
 
         await view_menu.start()
+        await menu_registry.register(view_menu, ctx.guild_id)
 
     except Exception as e:
         logger.error(f"Unexpected error during CSV validation: {e}", exc_info=True)
@@ -567,6 +646,7 @@ async def on_app_command_error(
 
 def run():
     setup_logging()
+    worker_pool.configure(os.getenv("WORKER_MODE", "thread"), os.getenv("WORKER_COUNT"))
 
     token = os.getenv("TOKEN")
     if not token:
@@ -578,3 +658,6 @@ def run():
     except Exception as e:
         logger.error(f"Failed to start bot: {e}", exc_info=True)
         raise
+    finally:
+        worker_pool.shutdown()
+        api.beatmap_index.save()
@@ -16,6 +16,18 @@ PAGE_SIZE = 25
 COOLDOWN_RATE = 10
 COOLDOWN_PER = 45
 
+MENU_MAX_ACTIVE = 500
+MENU_MAX_PER_GUILD = 20
+MENU_IDLE_TIMEOUT = 60  # seconds
+
+# Inputs at or above these sizes are processed in the worker pool
+CSV_OFFLOAD_BYTES = 64 * 1024  # 64 KiB
+MENU_OFFLOAD_RESPONSES = 250
+
+LOOP_LAG_INTERVAL = 1  # seconds
+LOOP_LAG_WARN_THRESHOLD = 0.25  # seconds
+STATS_INTERVAL = 15 * 60  # seconds
+
 SUCCESS_TEXT = "🥳 No disallowed beatmapsets found!"
 FAILURE_TEXT = "⛔ Disallowed beatmapsets found!"
 WARN_TEXT = "⚠️Ensure all flagged beatmapsets are compliant!"
@@ -29,6 +41,10 @@ ICON_OK = ":ballot_box_with_check:"
 
 OSU_BEATMAPSET_URL = "https://osu.ppy.sh/beatmapsets/{}"
 
+BEATMAP_INDEX_FILE = 'data/beatmap_index.json'
+BEATMAP_INDEX_MAX_ENTRIES = 250_000
+BEATMAP_INDEX_FLUSH_INTERVAL = 300  # seconds
+
 LOG_DIR = 'logs'
 LOG_FILE = 'logs/discord.log'
 LOG_MAX_BYTES = 32 * 1024 * 1024  # 32 MiB
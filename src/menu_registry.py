@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import discord
+from reactionmenu import ViewMenu
+
+logger = logging.getLogger("menu_registry")
+
+
+@dataclass
+class MenuEntry:
+    menu: ViewMenu
+    guild_id: Optional[int]
+    estimated_bytes: int
+    close_watcher: Optional[asyncio.Task] = None
+
+
+class MenuRegistry:
+    """Tracks live ViewMenus, bounding them in total and per guild.
+
+    Entries are kept in least-recently-used order. Evicted menus have their
+    buttons disabled and their pages dropped so the embeds can be freed. Idle
+    menus are left to the ViewMenu's own timeout. A menu is released here
+    whenever it closes, whatever stopped it.
+    DM menus are only bounded by the global cap.
+    """
+
+    def __init__(self, max_menus: int, max_menus_per_guild: int):
+        self.max_menus = max_menus
+        self.max_menus_per_guild = max_menus_per_guild
+        self._entries: OrderedDict[int, MenuEntry] = OrderedDict()
+
+    @property
+    def live_count(self) -> int:
+        return len(self._entries)
+
+    @property
+    def estimated_bytes(self) -> int:
+        return sum(entry.estimated_bytes for entry in self._entries.values())
+
+    def guild_count(self, guild_id: Optional[int]) -> int:
+        return sum(1 for entry in self._entries.values() if entry.guild_id == guild_id)
+
+    async def register(self, menu: ViewMenu, guild_id: Optional[int]) -> None:
+        """Registers a started menu, evicting the least recently used ones over the caps."""
+        if guild_id is not None:
+            while self.guild_count(guild_id) >= self.max_menus_per_guild:
+                await self._evict_oldest(
+                    [e for e in self._entries.values() if e.guild_id == guild_id]
+                )
+
+        while self.live_count >= self.max_menus:
+            await self._evict_oldest(list(self._entries.values()))
+
+        entry = MenuEntry(
+            menu=menu,
+            guild_id=guild_id,
+            estimated_bytes=MenuRegistry._estimate_bytes(menu),
+        )
+        self._entries[id(menu)] = entry
+        menu.set_relay(lambda _: self.touch(menu))
+        entry.close_watcher = asyncio.create_task(self._release_when_closed(menu))
+
+        logger.debug(
+            f"Registered menu for guild {guild_id}: "
+            f"{self.live_count} live, ~{self.estimated_bytes} bytes"
+        )
+
+    def touch(self, menu: ViewMenu) -> None:
+        if id(menu) in self._entries:
+            self._entries.move_to_end(id(menu))
+
+    def release(self, menu: ViewMenu) -> None:
+        """Forgets a menu that has already stopped and frees its pages."""
+        self._entries.pop(id(menu), None)
+        if not menu.is_running:
+            menu.remove_all_pages()
+
+    async def _release_when_closed(self, menu: ViewMenu) -> None:
+        await menu.wait_until_closed()
+        self.release(menu)
+
+    async def evict(self, menu: ViewMenu) -> None:
+        self._entries.pop(id(menu), None)
+        try:
+            await menu.stop(disable_items=True)
+        except discord.DiscordException as e:
+            logger.warning(f"Failed to disable evicted menu: {e}")
+
+        self.release(menu)
+
+    async def _evict_oldest(self, entries: list[MenuEntry]) -> None:
+        entry = entries[0]
+        logger.debug(f"Evicting least recently used menu for guild {entry.guild_id}")
+        await self.evict(entry.menu)
+
+    @staticmethod
+    def _estimate_bytes(menu: ViewMenu) -> int:
+        """Sums the UTF-8 size of the pages' embed text.
+
+        This is a lower bound: object overhead is not counted.
+        """
+        total = 0
+        for page in menu.pages or []:
+            embed = page.embed
+            if embed is None:
+                continue
+
+            texts = [
+                embed.title,
+                embed.description,
+                embed.footer.text,
+                embed.author.name,
+            ]
+            for field in embed.fields:
+                texts.extend((field.name, field.value))
+
+            for text in texts:
+                if text:
+                    total += len(text.encode("utf-8"))
+
+        return total
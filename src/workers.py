@@ -0,0 +1,120 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("workers")
+
+WORKER_MODES = ("thread", "process")
+
+
+class WorkerPool:
+    """Runs CPU-heavy stages off the event loop.
+
+    Threads are always available. In ``process`` mode, pure-data work (inputs
+    and outputs that can be pickled) is sent to a process pool instead.
+    """
+
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None):
+        self.mode = mode
+        self.max_workers = max_workers
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def configure(self, mode: str, max_workers: Optional[str]) -> None:
+        """Applies raw settings (e.g. from the environment), falling back on invalid values.
+
+        Must be called before any work is submitted.
+        """
+        mode = mode.lower()
+        if mode not in WORKER_MODES:
+            logger.warning(f"Unknown worker mode {mode!r}, falling back to threads")
+            mode = "thread"
+
+        count = None
+        if max_workers:
+            try:
+                count = int(max_workers)
+            except ValueError:
+                logger.warning(
+                    f"Invalid worker count {max_workers!r}, using the default"
+                )
+            if count is not None and count <= 0:
+                count = None
+
+        self.mode = mode
+        self.max_workers = count
+        logger.info(f"Worker pool: {mode} mode, {count or 'default'} worker(s)")
+
+    def _get_executor(self, pure: bool) -> Executor:
+        if pure and self.mode == "process":
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(self.max_workers)
+            return self._processes
+
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="omcc-worker"
+            )
+        return self._threads
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        offload: bool,
+        pure: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """Calls ``func`` inline, or in a worker when ``offload`` is set."""
+        if not offload:
+            return func(*args, **kwargs)
+
+        executor = self._get_executor(pure)
+        start = time.perf_counter()
+        result = await asyncio.get_running_loop().run_in_executor(
+            executor, functools.partial(func, *args, **kwargs)
+        )
+        logger.debug(
+            f"Ran {func.__qualname__} in {type(executor).__name__} "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
+        return result
+
+    def shutdown(self) -> None:
+        for executor in (self._threads, self._processes):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LoopLagMonitor:
+    """Measures how late periodic ticks run, i.e. how long the event loop was blocked."""
+
+    def __init__(self, interval: float, warn_threshold: float):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._last_tick: Optional[float] = None
+
+    def tick(self) -> float:
+        now = time.monotonic()
+        if self._last_tick is not None:
+            self.last_lag = max(0.0, now - self._last_tick - self.interval)
+            self.max_lag = max(self.max_lag, self.last_lag)
+        self._last_tick = now
+
+        if self.last_lag >= self.warn_threshold:
+            logger.warning(f"Event loop lagged by {self.last_lag:.3f}s")
+
+        return self.last_lag
+
+    def reset(self) -> None:
+        self._last_tick = None
+
+    def pop_max_lag(self) -> float:
+        """Returns the largest lag since the previous call."""
+        max_lag, self.max_lag = self.max_lag, 0.0
+        return max_lag